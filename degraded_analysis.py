@@ -7,7 +7,6 @@ import os.path
 import pdb
 import signal
 import subprocess
-import sys
 import tempfile
 
 import osgeo.gdal
@@ -20,11 +19,7 @@ import admin_names
 import geoutil
 
 
-pd.set_option("display.max_rows", 500)
-pd.set_option("display.max_columns", 40)
-pd.options.display.float_format = '{:.2f}'.format
 osgeo.gdal.PushErrorHandler("CPLQuietErrorHandler")
-np.set_printoptions(threshold=sys.maxsize)
 
 
 def start_pdb(sig, frame):
@@ -108,7 +103,7 @@ def produce_CSV():
 
                 mask_blk = mask_band.ReadAsArray(x, y, ncols, nrows)
                 k = geoutil.km2_block(nrows=nrows, ncols=ncols, y_off=y, img=maskimg)
-                k[np.logical_not(mask_blk)] = 0.0
+                k[mask_blk == 0] = 0.0
                 km2_blk = (np.repeat(np.repeat(k, 3, axis=1), 3, axis=0)) / 9.0
 
                 lc_blk = lc_band.ReadAsArray(3*x, 3*y, 3*ncols, 3*nrows)
@@ -168,5 +163,8 @@ def produce_CSV():
 
 if __name__ == '__main__':
     signal.signal(signal.SIGUSR1, start_pdb)
-    os.environ['GDAL_CACHEMAX'] = '128'
+    os.environ['GDAL_CACHEMAX'] = '2048'
+    pd.set_option("display.max_rows", 500)
+    pd.set_option("display.max_columns", 40)
+    pd.options.display.float_format = '{:.2f}'.format
     produce_CSV()
@@ -4,6 +4,8 @@
 """Extract counts of each Köppen-Geiger/slope/land cover/soil health for each country,
    for use in Project Drawdown solution models."""
 import argparse
+import collections
+import concurrent.futures
 import math
 import os.path
 import pdb
@@ -17,19 +19,77 @@ import osgeo.ogr
 import numpy as np
 import pandas as pd
 
+try:
+    import numba
+except ImportError:
+    numba = None
+
 import admin_names
 import geoutil
 
 
-pd.set_option("display.max_rows", 500)
-pd.set_option("display.max_columns", 40)
-pd.options.display.float_format = '{:.2f}'.format
 osgeo.gdal.PushErrorHandler("CPLQuietErrorHandler")
-np.set_printoptions(threshold=sys.maxsize)
+osgeo.gdal.SetConfigOption("GDAL_TIFF_DIRECT_IO", "YES")
 np.seterr(all='raise')
 
 
 
+def read_into(band, x, y, ncols, nrows, bufs, scale=1):
+    """Read a raster window into a preallocated buffer from bufs, keyed by window shape.
+
+       A block walk only ever sees four window shapes (interior, right edge, bottom
+       edge, corner), so after the first few reads every ReadAsArray lands in a reused
+       buffer instead of allocating a fresh numpy array per block.
+
+       With scale > 1 the buffer is 1/scale of the window in each dimension and GDAL
+       decimates the read to fit, serving it from a matching overview when the raster
+       (e.g. a COG) has one, reading scale² less data."""
+    brows = -(-nrows // scale)
+    bcols = -(-ncols // scale)
+    buf = bufs.get((brows, bcols))
+    if buf is None:
+        typecode = osgeo.gdal_array.GDALTypeCodeToNumericTypeCode(band.DataType)
+        buf = bufs[(brows, bcols)] = np.empty((brows, bcols), dtype=typecode)
+    return band.ReadAsArray(x, y, ncols, nrows, buf_obj=buf)
+
+
+if numba is not None:
+    @numba.njit(cache=True)
+    def _lut_areas_kernel(block, maskblock, km2col, lut, accum):
+        nrows, ncols = block.shape
+        for r in range(nrows):
+            w = km2col[r]
+            for c in range(ncols):
+                if maskblock[r, c]:
+                    ci = lut[block[r, c]]
+                    if ci >= 0:
+                        accum[ci] += w
+
+
+def lut_areas(block, maskblock, km2col, lut, ncolumns):
+    """Return a (ncolumns,) numpy array of the km² area of each class in one block.
+
+       lut is a 256-entry array mapping raster byte value to column position in the
+       output DataFrame, with -1 meaning skip the pixel (blank, water, etc)."""
+    bmin = block.min()
+    if bmin == block.max():
+        # Single-class block (open ocean, ice sheet, ...): one LUT probe and a
+        # weighted mask sum replace the histogram entirely.
+        accum = np.zeros(ncolumns)
+        ci = lut[bmin]
+        if ci >= 0:
+            accum[ci] = np.where(maskblock, km2col[:, np.newaxis], 0.0).sum()
+        return accum
+    if numba is not None:
+        accum = np.zeros(ncolumns)
+        _lut_areas_kernel(block, maskblock, km2col, lut, accum)
+        return accum
+    col_idx = lut[block]
+    weights = np.where(maskblock, km2col[:, np.newaxis], 0.0)
+    valid = col_idx >= 0
+    return np.bincount(col_idx[valid], weights=weights[valid], minlength=ncolumns)
+
+
 class KGlookup:
     """Lookup table of pixel color to Köppen-Geiger class.
 
@@ -50,25 +110,34 @@ class KGlookup:
         (178, 178, 178): 'ET',  (102, 102, 102): 'EF',
         }
 
-    def __init__(self, mapfilename, maskdim='1km'):
+    def __init__(self, mapfilename, maskdim='1km', scale=1):
+        self.ctor_args = (mapfilename, maskdim, scale)
         self.maskdim = maskdim
+        self.scale = scale
         self.img = osgeo.gdal.Open(mapfilename, osgeo.gdal.GA_ReadOnly)
         self.band = self.img.GetRasterBand(1)
         self.ctable = self.band.GetColorTable()
-
-    def km2(self, x, y, ncols, nrows, maskblock, km2block, df, admin):
-        block = self.band.ReadAsArray(x, y, ncols, nrows)
-        masked = np.ma.masked_array(block, mask=np.logical_not(maskblock))
-        for label in np.unique(masked):
-            if label is np.ma.masked:
-                continue
-            r, g, b, a = self.ctable.GetColorEntry(int(label))
-            color = (r, g, b)
-            if color == (255, 255, 255) or color == (0, 0, 0):
-                # blank pixel == masked off, just skip it.
-                continue
-            typ = self.kg_colors[color]
-            df.loc[admin, typ] += km2block[masked == label].sum()
+        # int-keyed mirror of kg_colors: r|g<<8|b<<16, avoiding a tuple build+hash per probe.
+        self._packed_colors = {(r | (g << 8) | (b << 16)): typ
+                for (r, g, b), typ in self.kg_colors.items()}
+        self.lut = self.build_lut()
+        self.bufs = {}
+
+    def build_lut(self):
+        """Return 256-entry LUT of raster byte value to column position (-1 == skip)."""
+        positions = {typ: i for i, typ in enumerate(self.get_columns())}
+        lut = np.full(256, -1, dtype=np.int32)
+        for label in range(self.ctable.GetCount()):
+            r, g, b, a = self.ctable.GetColorEntry(label)
+            typ = self._packed_colors.get(r | (g << 8) | (b << 16))
+            if typ is not None:
+                # colors not in kg_colors, like white or black, are blank pixels.
+                lut[label] = positions[typ]
+        return lut
+
+    def km2(self, x, y, ncols, nrows, maskblock, km2col, accum):
+        block = read_into(self.band, x, y, ncols, nrows, self.bufs, scale=self.scale)
+        accum += lut_areas(block, maskblock, km2col, self.lut, len(accum))
 
     def get_columns(self):
         return self.kg_colors.values()
@@ -95,18 +164,25 @@ class ESA_LC_lookup:
 
        So we don't need a lookup table, greyscale absolute values directly equal the LCCS class."""
 
-    def __init__(self, mapfilename, maskdim='333m'):
+    def __init__(self, mapfilename, maskdim='333m', scale=1):
+        self.ctor_args = (mapfilename, maskdim, scale)
         self.maskdim = maskdim
+        self.scale = scale
         self.img = osgeo.gdal.Open(mapfilename, osgeo.gdal.GA_ReadOnly)
         self.band = self.img.GetRasterBand(1)
+        self.lut = self.build_lut()
+        self.bufs = {}
 
-    def km2(self, x, y, ncols, nrows, maskblock, km2block, df, admin):
-        block = self.band.ReadAsArray(x, y, ncols, nrows)
-        masked = np.ma.masked_array(block, mask=np.logical_not(maskblock)).filled(-1)
-        for label in np.unique(masked):
-            if label is np.ma.masked or label == 0 or label == 255:
-                continue
-            df.loc[admin, label] += km2block[masked == label].sum()
+    def build_lut(self):
+        """Return 256-entry LUT of LCCS class to column position (-1 == skip)."""
+        lut = np.full(256, -1, dtype=np.int32)
+        for i, label in enumerate(self.get_columns()):
+            lut[label] = i
+        return lut
+
+    def km2(self, x, y, ncols, nrows, maskblock, km2col, accum):
+        block = read_into(self.band, x, y, ncols, nrows, self.bufs, scale=self.scale)
+        accum += lut_areas(block, maskblock, km2col, self.lut, len(accum))
 
     def get_columns(self):
         """Return list of LCCS classes present in this dataset."""
@@ -120,17 +196,18 @@ class GeomorphoLookup:
     """
     gaez_slopes = ["0-0.5%", "0.5-2%", "2-5%", "5-10%", "10-15%", "15-30%", "30-45%", ">45%"]
 
-    def __init__(self, mapfilename, maskdim='1km'):
+    def __init__(self, mapfilename, maskdim='1km', scale=1):
+        self.ctor_args = (mapfilename, maskdim, scale)
         self.maskdim = maskdim
+        self.scale = scale
         self.img = osgeo.gdal.Open(mapfilename, osgeo.gdal.GA_ReadOnly)
+        self.bufs = {}
 
-    def km2(self, x, y, ncols, nrows, maskblock, km2block, df, admin):
+    def km2(self, x, y, ncols, nrows, maskblock, km2col, accum):
         for b in range(1, 9):
-            block = self.img.GetRasterBand(b).ReadAsArray(x, y, ncols, nrows).astype(np.float)
-            mask = np.logical_or(np.logical_not(maskblock), block == 127)
-            masked = np.ma.masked_array(block, mask=mask, fill_value=0.0)
-            typ = self.gaez_slopes[b - 1]
-            df.loc[admin, typ] += (km2block * (masked / 100.0)).sum()
+            block = read_into(self.img.GetRasterBand(b), x, y, ncols, nrows, self.bufs, scale=self.scale)
+            valid = np.logical_and(maskblock != 0, block != 127)
+            accum[b - 1] += (np.where(valid, block, 0) * km2col[:, np.newaxis]).sum() / 100.0
 
     def get_columns(self):
         """Return list of GAEZ slope classes."""
@@ -142,20 +219,21 @@ class FaoSlopeLookup:
     """
     gaez_slopes = ["0-0.5%", "0.5-2%", "2-5%", "5-8%", "8-15%", "15-30%", "30-45%", ">45%"]
 
-    def __init__(self, maskdim='1km'):
+    def __init__(self, maskdim='1km', scale=1):
+        self.ctor_args = (maskdim, scale)
         self.maskdim = maskdim
+        self.scale = scale
         self.img = {}
         for i in range(1, 9):
             mapfilename = f"data/FAO/GloSlopesCl{i}_30as.tif"
             self.img[i] = osgeo.gdal.Open(mapfilename, osgeo.gdal.GA_ReadOnly)
+        self.bufs = {}
 
-    def km2(self, x, y, ncols, nrows, maskblock, km2block, df, admin):
+    def km2(self, x, y, ncols, nrows, maskblock, km2col, accum):
         for i in range(1, 9):
-            block = self.img[i].GetRasterBand(1).ReadAsArray(x, y, ncols, nrows).astype(np.float)
-            mask = np.logical_or(np.logical_not(maskblock), block == 255)
-            masked = np.ma.masked_array(block, mask=mask).filled(0.0)
-            typ = self.gaez_slopes[i - 1]
-            df.loc[admin, typ] += np.nansum(km2block * (masked / 100.0))
+            block = read_into(self.img[i].GetRasterBand(1), x, y, ncols, nrows, self.bufs, scale=self.scale)
+            valid = np.logical_and(maskblock != 0, block != 255)
+            accum[i - 1] += np.nansum(np.where(valid, block, 0) * km2col[:, np.newaxis]) / 100.0
 
     def get_columns(self):
         """Return list of GAEZ slope classes."""
@@ -165,19 +243,27 @@ class FaoSlopeLookup:
 class WorkabilityLookup:
     """Workability TIF has been pre-processed, pixel values are workability class.
     """
-    def __init__(self, mapfilename, maskdim='1km'):
+    def __init__(self, mapfilename, maskdim='1km', scale=1):
+        self.ctor_args = (mapfilename, maskdim, scale)
         self.maskdim = maskdim
+        self.scale = scale
         self.img = osgeo.gdal.Open(mapfilename, osgeo.gdal.GA_ReadOnly)
         self.band = self.img.GetRasterBand(1)
+        self.lut = self.build_lut()
+        self.bufs = {}
 
-    def km2(self, x, y, ncols, nrows, maskblock, km2block, df, admin):
-        block = self.band.ReadAsArray(x, y, ncols, nrows)
-        masked = np.ma.masked_array(block, mask=np.logical_not(maskblock))
-        for label in np.unique(masked):
-            if label is np.ma.masked or label == 0 or label == 255:
-                # label 0 (black) == no land cover (like water), just skip it.
-                continue
-            df.loc[admin, label] += km2block[masked == label].sum()
+    def build_lut(self):
+        """Return 256-entry LUT of workability class to column position (-1 == skip).
+
+           label 0 (black) == no land cover (like water), just skip it."""
+        lut = np.full(256, -1, dtype=np.int32)
+        for i, label in enumerate(self.get_columns()):
+            lut[label] = i
+        return lut
+
+    def km2(self, x, y, ncols, nrows, maskblock, km2col, accum):
+        block = read_into(self.band, x, y, ncols, nrows, self.bufs, scale=self.scale)
+        accum += lut_areas(block, maskblock, km2col, self.lut, len(accum))
 
     def get_columns(self):
         return range(1, 8)
@@ -185,21 +271,20 @@ class WorkabilityLookup:
 
 class DegradedLandLookup:
     """Binary indication of soil in LDPclass 1, 2, or 3."""
-    def __init__(self, mapfilename, maskdim='1km'):
+    def __init__(self, mapfilename, maskdim='1km', scale=1):
+        self.ctor_args = (mapfilename, maskdim, scale)
         self.maskdim = maskdim
+        self.scale = scale
         self.img = osgeo.gdal.Open(mapfilename, osgeo.gdal.GA_ReadOnly)
         self.band = self.img.GetRasterBand(1)
+        self.bufs = {}
 
-    def km2(self, x, y, ncols, nrows, maskblock, km2block, df, admin):
-        block = self.band.ReadAsArray(x, y, ncols, nrows)
-        masked = np.ma.masked_array(block, mask=np.logical_not(maskblock))
-        for label in np.unique(masked):
-            if label is np.ma.masked:
-                continue
-            if label == 0.0:
-                df.loc[admin, "nondegraded"] += km2block[masked == label].sum()
-            else:
-                df.loc[admin, "degraded"] += km2block[masked == label].sum()
+    def km2(self, x, y, ncols, nrows, maskblock, km2col, accum):
+        block = read_into(self.band, x, y, ncols, nrows, self.bufs, scale=self.scale)
+        weights = np.where(maskblock, km2col[:, np.newaxis], 0.0)
+        nondegraded = weights[block == 0.0].sum()
+        accum[0] += weights.sum() - nondegraded  # degraded
+        accum[1] += nondegraded
 
     def get_columns(self):
         return ["degraded", "nondegraded"]
@@ -210,44 +295,83 @@ def start_pdb(sig, frame):
     pdb.Pdb().set_trace(frame)
 
 
+def process_feature(lookup_class, ctor_args, admin, a3, idx):
+    """Process one country in a worker, returning (admin, per-column area vector)."""
+    lookupobj = lookup_class(*ctor_args)
+    accum = np.zeros(len(lookupobj.get_columns()))
+
+    print(f"Processing {admin:<41} #{a3}_{idx}")
+    maskfilename = f"masks/{a3}_{idx}_{lookupobj.maskdim}_mask._tif"
+    maskimg = osgeo.gdal.Open(maskfilename, osgeo.gdal.GA_ReadOnly)
+    maskband = maskimg.GetRasterBand(1)
+    x_siz = maskband.XSize
+    y_siz = maskband.YSize
+    x_blksiz, y_blksiz = maskband.GetBlockSize()
+    maskbufs = {}
+    for y in range(0, y_siz, y_blksiz):
+        nrows = geoutil.blklim(coord=y, blksiz=y_blksiz, totsiz=y_siz)
+        for x in range(0, x_siz, x_blksiz):
+            ncols = geoutil.blklim(coord=x, blksiz=x_blksiz, totsiz=x_siz)
+            if geoutil.is_sparse(band=maskband, x=x, y=y, ncols=ncols, nrows=nrows):
+                # sparse hole in image, no data to process
+                continue
+
+            maskblock = read_into(maskband, x, y, ncols, nrows, maskbufs)
+            km2col = geoutil.km2_column(nrows=nrows, y_off=y, img=maskimg)
+            if lookupobj.scale > 1:
+                # decimate the mask to match the reduced-resolution map read; each
+                # remaining sample stands in for scale² pixels of area.
+                s = lookupobj.scale
+                maskblock = maskblock[::s, ::s]
+                km2col = km2col[::s] * (s * s)
+            lookupobj.km2(x=x, y=y, ncols=ncols, nrows=nrows, maskblock=maskblock,
+                          km2col=km2col, accum=accum)
+    return (admin, accum)
+
+
+def write_csv(df, filename, float_format='%.2f'):
+    """Write df to a CSV file via np.savetxt.
+
+       Equivalent to df.to_csv(filename, float_format=float_format) for a string
+       index and numeric columns, without pandas' per-cell Python formatter."""
+    index = np.array([f'"{name}"' if ',' in str(name) else str(name) for name in df.index],
+            dtype=object)
+    data = np.empty((len(df.index), len(df.columns) + 1), dtype=object)
+    data[:, 0] = index
+    data[:, 1:] = df.to_numpy()
+    with open(filename, 'w') as f:
+        f.write(','.join([df.index.name] + [str(c) for c in df.columns]) + '\n')
+        np.savetxt(f, data, fmt=['%s'] + [float_format] * len(df.columns), delimiter=',')
+
+
 def process_map(lookupobj, csvfilename):
-    """Produce a CSV file of areas per country from a dataset."""
+    """Produce a CSV file of areas per country from a dataset.
+
+       Countries are independent of one another, so they are farmed out to a pool
+       of worker processes and the per-country vectors summed as they come back."""
     shapefilename = 'data/ne_10m_admin_0_countries/ne_10m_admin_0_countries.shp'
-    df = pd.DataFrame(columns=lookupobj.get_columns(), dtype=float)
-    df.index.name = 'Country'
     shapefile = osgeo.ogr.Open(shapefilename)
     assert shapefile.GetLayerCount() == 1
     layer = shapefile.GetLayerByIndex(0)
 
+    tasks = []
     for idx, feature in enumerate(layer):
         admin = admin_names.lookup(feature.GetField("ADMIN"))
         if admin is None:
             continue
         a3 = feature.GetField("SOV_A3")
-        if admin not in df.index:
-            df.loc[admin] = [0] * len(df.columns)
-
-        print(f"Processing {admin:<41} #{a3}_{idx}")
-        maskfilename = f"masks/{a3}_{idx}_{lookupobj.maskdim}_mask._tif"
-        maskimg = osgeo.gdal.Open(maskfilename, osgeo.gdal.GA_ReadOnly)
-        maskband = maskimg.GetRasterBand(1)
-        x_siz = maskband.XSize
-        y_siz = maskband.YSize
-        x_blksiz, y_blksiz = maskband.GetBlockSize()
-        for y in range(0, y_siz, y_blksiz):
-            nrows = geoutil.blklim(coord=y, blksiz=y_blksiz, totsiz=y_siz)
-            for x in range(0, x_siz, x_blksiz):
-                ncols = geoutil.blklim(coord=x, blksiz=x_blksiz, totsiz=x_siz)
-                if geoutil.is_sparse(band=maskband, x=x, y=y, ncols=ncols, nrows=nrows):
-                    # sparse hole in image, no data to process
-                    continue
-
-                maskblock = maskband.ReadAsArray(x, y, ncols, nrows)
-                km2block = geoutil.km2_block(nrows=nrows, ncols=ncols, y_off=y, img=maskimg)
-                lookupobj.km2(x=x, y=y, ncols=ncols, nrows=nrows, maskblock=maskblock,
-                              km2block=km2block, df=df, admin=admin)
+        tasks.append((type(lookupobj), lookupobj.ctor_args, admin, a3, idx))
+
+    results = collections.defaultdict(lambda: np.zeros(len(lookupobj.get_columns())))
+    with concurrent.futures.ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        for (admin, areas) in executor.map(process_feature, *zip(*tasks)):
+            results[admin] += areas
+
+    df = pd.DataFrame(list(results.values()), index=list(results.keys()),
+            columns=lookupobj.get_columns())
+    df.index.name = 'Country'
     outputfilename = os.path.join('results', csvfilename)
-    df.sort_index(axis='index').to_csv(outputfilename, float_format='%.2f')
+    write_csv(df.sort_index(axis='index'), outputfilename)
     return df
 
 
@@ -260,12 +384,15 @@ def output_by_region(df, csvfilename):
         region = admin_names.region_mapping[country]
         if region is not None:
             df_region.loc[region, :] += row
-    df_region.to_csv(csvfilename, float_format='%.2f')
+    write_csv(df_region, csvfilename)
 
 
 if __name__ == '__main__':
     signal.signal(signal.SIGUSR1, start_pdb)
-    os.environ['GDAL_CACHEMAX'] = '128'
+    os.environ['GDAL_CACHEMAX'] = '2048'
+    pd.set_option("display.max_rows", 500)
+    pd.set_option("display.max_columns", 40)
+    pd.options.display.float_format = '{:.2f}'.format
 
     parser = argparse.ArgumentParser(description='Process GeoTIFF datasets for Project Drawdown')
     parser.add_argument('--lc', default=False, required=False,
@@ -280,45 +407,48 @@ if __name__ == '__main__':
                         action='store_true', help='process degraded land')
     parser.add_argument('--all', default=False, required=False,
                         action='store_true', help='process all')
+    parser.add_argument('--coarse', default=1, required=False, type=int, metavar='N',
+                        help='decimate reads by N in each dimension, using raster '
+                             'overviews where present. Faster, at reduced accuracy')
     args = parser.parse_args()
     processed = False
 
     if args.lc or args.all:
-        mapfilename = 'data/copernicus/C3S-LC-L4-LCCS-Map-300m-P1Y-2018-v2.1.1.tif'
+        mapfilename = geoutil.ensure_cog('data/copernicus/C3S-LC-L4-LCCS-Map-300m-P1Y-2018-v2.1.1.tif')
         countrycsv = 'Land-Cover-by-country.csv'
         regioncsv = 'Land-Cover-by-region.csv'
-        lookupobj = ESA_LC_lookup(mapfilename)
+        lookupobj = ESA_LC_lookup(mapfilename, scale=args.coarse)
         df = process_map(lookupobj=lookupobj, csvfilename=countrycsv)
         output_by_region(df=df, csvfilename=regioncsv)
         print('\n')
         processed = True
 
     if args.kg or args.all:
-        mapfilename = 'data/Beck_KG_V1/Beck_KG_V1_present_0p0083.tif'
+        mapfilename = geoutil.ensure_cog('data/Beck_KG_V1/Beck_KG_V1_present_0p0083.tif')
         countrycsv = 'Köppen-Geiger-present-by-country.csv'
         regioncsv = 'Köppen-Geiger-present-by-region.csv'
         print(mapfilename)
-        lookupobj = KGlookup(mapfilename)
+        lookupobj = KGlookup(mapfilename, scale=args.coarse)
         df = process_map(lookupobj=lookupobj, csvfilename=countrycsv)
         output_by_region(df=df, csvfilename=regioncsv)
         print('\n')
 
-        mapfilename = 'data/Beck_KG_V1/Beck_KG_V1_future_0p0083.tif'
+        mapfilename = geoutil.ensure_cog('data/Beck_KG_V1/Beck_KG_V1_future_0p0083.tif')
         countrycsv = 'Köppen-Geiger-future-by-country.csv'
         regioncsv = 'Köppen-Geiger-future-by-region.csv'
         print(mapfilename)
-        lookupobj = KGlookup(mapfilename)
+        lookupobj = KGlookup(mapfilename, scale=args.coarse)
         df = process_map(lookupobj=lookupobj, csvfilename=countrycsv)
         output_by_region(df=df, csvfilename=regioncsv)
         print('\n')
         processed = True
 
     if args.sl or args.all:
-        mapfilename = 'data/geomorpho90m/classified_slope_merit_dem_1km_s0..0cm_2018_v1.0.tif'
+        mapfilename = geoutil.ensure_cog('data/geomorpho90m/classified_slope_merit_dem_1km_s0..0cm_2018_v1.0.tif')
         countrycsv = 'Slope-by-country.csv'
         regioncsv = 'Slope-by-region.csv'
         print(mapfilename)
-        lookupobj = GeomorphoLookup(mapfilename=mapfilename)
+        lookupobj = GeomorphoLookup(mapfilename=mapfilename, scale=args.coarse)
         df = process_map(lookupobj=lookupobj, csvfilename=countrycsv)
         output_by_region(df=df, csvfilename=regioncsv)
         print('\n')
@@ -327,18 +457,18 @@ if __name__ == '__main__':
         countrycsv = 'FAO-Slope-by-country.csv'
         regioncsv = 'FAO-Slope-by-region.csv'
         print('data/FAO/GloSlopesCl*_30as.tif')
-        lookupobj = FaoSlopeLookup()
+        lookupobj = FaoSlopeLookup(scale=args.coarse)
         df = process_map(lookupobj=lookupobj, csvfilename=countrycsv)
         output_by_region(df=df, csvfilename=regioncsv)
         print('\n')
         processed = True
 
     if args.wk or args.all:
-        mapfilename = 'data/FAO/workability_FAO_sq7_1km.tif'
+        mapfilename = geoutil.ensure_cog('data/FAO/workability_FAO_sq7_1km.tif')
         countrycsv = 'Workability-by-country.csv'
         regioncsv = 'Workability-by-region.csv'
         print(mapfilename)
-        lookupobj = WorkabilityLookup(mapfilename)
+        lookupobj = WorkabilityLookup(mapfilename, scale=args.coarse)
         df = process_map(lookupobj=lookupobj, csvfilename=countrycsv)
         output_by_region(df=df, csvfilename=regioncsv)
         print('\n')
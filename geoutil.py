@@ -4,25 +4,52 @@
 """Geo-related utilities for Project Drawdown data pipelines."""
 
 import math
+import os.path
+
 import numpy as np
 import osgeo.gdal
 
-def km2_block(nrows, ncols, y_off, img):
-    """Return (nrows,ncols) numpy array of pixel area in sq km."""
+def km2_column(nrows, y_off, img):
+    """Return (nrows,) numpy array of pixel area in sq km.
+
+       Pixel area depends only on latitude, so one value per row of the image suffices."""
     x_mindeg, x_sizdeg, x_rot, y_mindeg, y_rotdeg, y_sizdeg = img.GetGeoTransform()
     yrad = math.radians(abs(y_sizdeg))
-    km2 = np.empty((nrows, ncols))
-    y = math.radians(y_mindeg + (y_off * y_sizdeg)) - (yrad / 2)
-    for i in range(nrows):
-        # https://en.wikipedia.org/wiki/Longitude#Length_of_a_degree_of_longitude
-        xlen = abs(x_sizdeg) * (math.cos(y) * math.pi * 6378.137 /
-                (180 * math.sqrt(1 - 0.00669437999014 * (math.sin(y) ** 2))))
-        # https://en.wikipedia.org/wiki/Latitude#Length_of_a_degree_of_latitude
-        ylen = abs(y_sizdeg) * (111.132954 - (0.559822 * math.cos(2 * y)) +
-                (0.001175 * math.cos(4 * y)))
-        km2[i, :] = xlen * ylen
-        y -= yrad
-    return km2
+    y = math.radians(y_mindeg + (y_off * y_sizdeg)) - (yrad / 2) - np.arange(nrows) * yrad
+    # https://en.wikipedia.org/wiki/Longitude#Length_of_a_degree_of_longitude
+    xlen = abs(x_sizdeg) * (np.cos(y) * math.pi * 6378.137 /
+            (180 * np.sqrt(1 - 0.00669437999014 * (np.sin(y) ** 2))))
+    # https://en.wikipedia.org/wiki/Latitude#Length_of_a_degree_of_latitude
+    ylen = abs(y_sizdeg) * (111.132954 - (0.559822 * np.cos(2 * y)) +
+            (0.001175 * np.cos(4 * y)))
+    return xlen * ylen
+
+
+def km2_block(nrows, ncols, y_off, img):
+    """Return (nrows,ncols) numpy array of pixel area in sq km."""
+    column = km2_column(nrows=nrows, y_off=y_off, img=img)
+    return np.repeat(column[:, np.newaxis], ncols, axis=1)
+
+
+def ensure_cog(mapfilename):
+    """Return the name of a Cloud Optimized GeoTIFF version of mapfilename.
+
+       A raster without tiling and overviews forces GDAL to decompress far more data
+       than a block read needs. If mapfilename is already a COG return it unchanged,
+       otherwise translate it once to a sibling .cog.tif (reused on later runs).
+       Overviews are built with NEAREST, as these are categorical rasters."""
+    img = osgeo.gdal.Open(mapfilename, osgeo.gdal.GA_ReadOnly)
+    if img.GetMetadataItem('LAYOUT', 'IMAGE_STRUCTURE') == 'COG':
+        return mapfilename
+    if osgeo.gdal.GetDriverByName('COG') is None:
+        # GDAL older than 3.1 cannot write COG, use the original file.
+        return mapfilename
+    cogfilename = mapfilename + '.cog.tif'
+    if not os.path.exists(cogfilename):
+        osgeo.gdal.Translate(cogfilename, img, format='COG',
+                creationOptions=['COMPRESS=DEFLATE', 'BLOCKSIZE=512',
+                    'OVERVIEW_RESAMPLING=NEAREST', 'NUM_THREADS=ALL_CPUS'])
+    return cogfilename
 
 
 def is_sparse(band, x, y, ncols, nrows):
@@ -1,48 +1,47 @@
 import os.path
-import tempfile
 import time
 
 import numpy as np
 import osgeo.gdal
 import osgeo.ogr
 
-def rasterize_one_feature(img, feature, layer, outfile):
-    """Rasterize a shapefile to TIFF."""
-    # Step 1: extract one feature from the original, and make a new shapefile.
-    tmpdir = tempfile.TemporaryDirectory()
-    new_shapefile = os.path.join(tmpdir.name, 'feature.shp')
-    shp_drv = osgeo.ogr.GetDriverByName("ESRI Shapefile")
-    new_data_source = shp_drv.CreateDataSource(new_shapefile)
+def one_feature_datasource(feature, layer):
+    """Return an in-memory OGR datasource holding one feature from layer.
+
+       The Memory driver avoids writing, closing and re-parsing an ESRI Shapefile
+       on disk for every feature, and the datasource can be rasterized against
+       several reference rasters without re-extracting the feature."""
+    mem_drv = osgeo.ogr.GetDriverByName("Memory")
+    new_data_source = mem_drv.CreateDataSource("feature")
     srs = layer.GetSpatialRef()
     new_layer = new_data_source.CreateLayer("feature", geom_type=osgeo.ogr.wkbPolygon, srs=srs)
     new_feat = osgeo.ogr.Feature(layer.GetLayerDefn())
     new_feat.SetGeometry(feature.GetGeometryRef())
     new_layer.CreateFeature(new_feat)
+    return new_data_source
+
 
-    # Close datasets. GDAL needs this as it implements some of the work in the destructor.
-    new_feat = None
-    new_data_source = None
-    new_layer = None
+def rasterize_one_feature(img, feature_ds, outfile):
+    """Rasterize a single-feature datasource to TIFF."""
+    new_layer = feature_ds.GetLayer()
 
-    # Step 2: Rasterize the new shapefile to an in-memory buffer.
+    # Step 1: Rasterize the in-memory layer to an in-memory buffer.
     x_siz = img.RasterXSize
     y_siz = img.RasterYSize
     mem_output = osgeo.gdal.GetDriverByName('MEM').Create('', x_siz, y_siz, 1, osgeo.gdal.GDT_Byte)
     mem_output.SetProjection(img.GetProjection())
     mem_output.SetGeoTransform(img.GetGeoTransform())
-    data_source = shp_drv.Open(new_shapefile, 0)
-    new_layer = data_source.GetLayer()
     osgeo.gdal.RasterizeLayer(mem_output, [1], new_layer)
 
-    # Step 3: Copy the active pixels to the output file.
-    # The extra copy between steps 3 & 4 is needed to get a Sparse GeoTIFF file, where empty
+    # Step 2: Copy the active pixels to the output file.
+    # The extra copy between steps 1 & 2 is needed to get a Sparse GeoTIFF file, where empty
     # areas of the raster are omitted from the file entirely. This does reduce the size of the
     # file, but the main reason for doing it is to allow the subsequent steps using this raster
     # as a mask to completely skip processing the empty blocks.
     output = osgeo.gdal.GetDriverByName('GTiff').Create(
             outfile, x_siz, y_siz, 1, osgeo.gdal.GDT_Byte,
             # ZSTD: 2.3 Megs, DEFLATE: 3.8 Megs, LZW: 15 Megs, PACKBITS: 67 Megs
-            options=['NBITS=1', 'COMPRESS=ZSTD', 'TILED=YES', 'NUM_THREADS=2', 'SPARSE_OK=TRUE'])
+            options=['NBITS=1', 'COMPRESS=ZSTD', 'TILED=YES', 'NUM_THREADS=ALL_CPUS', 'SPARSE_OK=TRUE'])
     output.SetProjection(img.GetProjectionRef())
     output.SetGeoTransform(img.GetGeoTransform())
 
@@ -69,26 +68,26 @@ def process_shapefile():
     shapefile = shp_drv.Open(shapefilename, 0)
     layer = shapefile.GetLayerByIndex(0)
 
-    img = osgeo.gdal.Open('data/Beck_KG_V1/Beck_KG_V1_present_0p0083.tif', osgeo.gdal.GA_ReadOnly)
-    for idx, feature in enumerate(layer):
-        a3 = feature.GetField("SOV_A3")
-        outfile = f'masks/{a3}_{idx}_1km_mask._tif'
-        print(f'{outfile}')
-        rasterize_one_feature(img=img, feature=feature, layer=layer, outfile=outfile)
-
-    img = osgeo.gdal.Open('data/copernicus/C3S-LC-L4-LCCS-Map-300m-P1Y-2018-v2.1.1.tif', osgeo.gdal.GA_ReadOnly)
-    for idx, feature in enumerate(layer):
-        a3 = feature.GetField("SOV_A3")
-        outfile = f'masks/{a3}_{idx}_333m_mask._tif'
-        print(f'{outfile}')
-        rasterize_one_feature(img=img, feature=feature, layer=layer, outfile=outfile)
-
-    img = osgeo.gdal.Open('data/Beck_KG_V1/Beck_KG_V1_present_0p5.tif', osgeo.gdal.GA_ReadOnly)
+    imgs = {
+        '1km': osgeo.gdal.Open('data/Beck_KG_V1/Beck_KG_V1_present_0p0083.tif',
+            osgeo.gdal.GA_ReadOnly),
+        '333m': osgeo.gdal.Open('data/copernicus/C3S-LC-L4-LCCS-Map-300m-P1Y-2018-v2.1.1.tif',
+            osgeo.gdal.GA_ReadOnly),
+        '0p5': osgeo.gdal.Open('data/Beck_KG_V1/Beck_KG_V1_present_0p5.tif',
+            osgeo.gdal.GA_ReadOnly),
+    }
     for idx, feature in enumerate(layer):
         a3 = feature.GetField("SOV_A3")
-        outfile = f'masks/{a3}_{idx}_0p5_mask._tif'
-        print(f'{outfile}')
-        rasterize_one_feature(img=img, feature=feature, layer=layer, outfile=outfile)
+        feature_ds = None
+        for maskdim, img in imgs.items():
+            outfile = f'masks/{a3}_{idx}_{maskdim}_mask._tif'
+            if os.path.exists(outfile):
+                # country boundaries do not change between runs, keep the cached mask.
+                continue
+            if feature_ds is None:
+                feature_ds = one_feature_datasource(feature=feature, layer=layer)
+            print(f'{outfile}')
+            rasterize_one_feature(img=img, feature_ds=feature_ds, outfile=outfile)
 
 
 if __name__ == '__main__':
@@ -9,7 +9,6 @@ import os.path
 import pdb
 import signal
 import subprocess
-import sys
 import tempfile
 
 import osgeo.gdal
@@ -22,11 +21,7 @@ import admin_names
 import geoutil
 
 
-pd.set_option("display.max_rows", 500)
-pd.set_option("display.max_columns", 40)
-pd.options.display.float_format = '{:.2f}'.format
 osgeo.gdal.PushErrorHandler("CPLQuietErrorHandler")
-np.set_printoptions(threshold=sys.maxsize)
 
 
 # color table entries
@@ -251,7 +246,7 @@ def produce_CSV():
 
                 mask_blk = mask_band.ReadAsArray(x, y, ncols, nrows)
                 k = geoutil.km2_block(nrows=nrows, ncols=ncols, y_off=y, img=maskimg)
-                k[np.logical_not(mask_blk)] = 0.0
+                k[mask_blk == 0] = 0.0
                 km2_blk = (np.repeat(np.repeat(k, 3, axis=1), 3, axis=0)) / 9.0
 
                 k = kg_band.ReadAsArray(x, y, ncols, nrows)
@@ -303,7 +298,7 @@ def create_AEZ_GeoTIFF(ref_img, filename):
     # DEFLATE: 158298535 bytes
     # ZSTD:    151202552 bytes (but not compatible with most non-GDAL 2.3+ TIFF apps)
     out = drv.Create(filename, xsize=ref_img.RasterXSize, ysize=ref_img.RasterYSize, bands=1,
-            eType=osgeo.gdal.GDT_Byte, options = ['COMPRESS=DEFLATE', 'TILED=YES', 'NUM_THREADS=2'])
+            eType=osgeo.gdal.GDT_Byte, options = ['COMPRESS=DEFLATE', 'TILED=YES', 'NUM_THREADS=ALL_CPUS'])
     out.SetProjection(ref_img.GetProjectionRef())
     out.SetGeoTransform(ref_img.GetGeoTransform())
 
@@ -329,7 +324,7 @@ def create_slope_GeoTIFF(ref_img, filename):
     drv = osgeo.gdal.GetDriverByName(ref_img.GetDriver().ShortName)
     out = drv.Create(filename, xsize=ref_img.RasterXSize, ysize=ref_img.RasterYSize, bands=1,
             eType=osgeo.gdal.GDT_Byte,
-            options = ['COMPRESS=DEFLATE', 'TILED=YES', 'NUM_THREADS=2', 'NBITS=2'])
+            options = ['COMPRESS=DEFLATE', 'TILED=YES', 'NUM_THREADS=ALL_CPUS', 'NBITS=2'])
     out.SetProjection(ref_img.GetProjectionRef())
     out.SetGeoTransform(ref_img.GetGeoTransform())
 
@@ -350,7 +345,7 @@ def create_land_use_GeoTIFF(ref_img, filename):
     drv = osgeo.gdal.GetDriverByName(ref_img.GetDriver().ShortName)
     out = drv.Create(filename, xsize=ref_img.RasterXSize, ysize=ref_img.RasterYSize, bands=1,
             eType=osgeo.gdal.GDT_Byte,
-            options = ['COMPRESS=DEFLATE', 'TILED=YES', 'NUM_THREADS=2', 'NBITS=4'])
+            options = ['COMPRESS=DEFLATE', 'TILED=YES', 'NUM_THREADS=ALL_CPUS', 'NBITS=4'])
     out.SetProjection(ref_img.GetProjectionRef())
     out.SetGeoTransform(ref_img.GetGeoTransform())
 
@@ -376,7 +371,7 @@ def create_soil_health_GeoTIFF(ref_img, filename):
     drv = osgeo.gdal.GetDriverByName(ref_img.GetDriver().ShortName)
     out = drv.Create(filename, xsize=ref_img.RasterXSize, ysize=ref_img.RasterYSize, bands=1,
             eType=osgeo.gdal.GDT_Byte,
-            options = ['COMPRESS=DEFLATE', 'TILED=YES', 'NUM_THREADS=2', 'NBITS=3'])
+            options = ['COMPRESS=DEFLATE', 'TILED=YES', 'NUM_THREADS=ALL_CPUS', 'NBITS=3'])
     out.SetProjection(ref_img.GetProjectionRef())
     out.SetGeoTransform(ref_img.GetGeoTransform())
 
@@ -510,7 +505,10 @@ def produce_PNGs():
 
 if __name__ == '__main__':
     signal.signal(signal.SIGUSR1, start_pdb)
-    os.environ['GDAL_CACHEMAX'] = '128'
+    os.environ['GDAL_CACHEMAX'] = '2048'
+    pd.set_option("display.max_rows", 500)
+    pd.set_option("display.max_columns", 40)
+    pd.options.display.float_format = '{:.2f}'.format
     produce_CSV()
     produce_GeoTIFF()
     produce_PNGs()
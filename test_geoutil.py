@@ -16,6 +16,12 @@ def test_km2_block():
     actual = geoutil.km2_block(nrows=1, ncols=1, y_off=((21600/2) - 1), img=img)
     assert actual == pytest.approx(expected, rel=1e-2)
 
+def test_km2_column():
+    img = osgeo.gdal.Open(imgfilename, osgeo.gdal.GA_ReadOnly)
+    column = geoutil.km2_column(nrows=4, y_off=0, img=img)
+    block = geoutil.km2_block(nrows=4, ncols=3, y_off=0, img=img)
+    assert column == pytest.approx(block[:, 0])
+
 def test_is_sparse():
     img = osgeo.gdal.Open(imgfilename, osgeo.gdal.GA_ReadOnly)
     band = img.GetRasterBand(1)